@@ -0,0 +1,75 @@
+"""
+Link extraction helpers for the Gigahertz FM Links Library Generator
+Kept in their own fully annotated module so they can be compiled ahead of time with mypyc
+"""
+
+import re
+from html import unescape
+from typing import List, Dict, Tuple
+
+# Lowercased markers delimiting the links section of an episode body
+LINKS_SECTION_HEADERS = (b'links do epis', b'links do show')
+LINKS_SECTION_TERMINATORS = (b'<h2', b'<h3')
+
+# Single-pass link extraction over the encoded body: <a ... href=...>text</a>.
+# The attribute name must follow whitespace so data-href, xlink:href and
+# :href are not mistaken for href. The text group cannot run past another
+# <a or </a, so an unclosed anchor fails fast instead of scanning to the end
+# of the body for each match
+ANCHOR_RE = re.compile(
+    rb'<a\b[^>]*?\shref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))[^>]*>'
+    rb'([^<]*(?:<(?!/?a\b)[^<]*)*)</a\s*>',
+    re.IGNORECASE
+)
+TAG_RE = re.compile(rb'<[^>]*>')
+
+def extract_episode_links(body_html: str) -> List[Dict[str, str]]:
+    """Extract links from the episode body, specifically from 'LINKS DO EPISÓDIO' section"""
+    if not body_html:
+        return []
+    
+    # Show notes without a single anchor tag need no further work; two
+    # substring checks avoid lowercasing the whole body just for this
+    if '<a' not in body_html and '<A' not in body_html:
+        return []
+    
+    data = body_html.encode('utf-8')
+    
+    # Find the "LINKS DO EPISÓDIO" section with plain substring searches.
+    # bytes.lower() only folds ASCII, so offsets stay valid for the original
+    # data; the non-ASCII "Ó" is left out of the markers for the same reason.
+    # Common variations: "LINKS DO EPISÓDIO", "Links do Episódio", "LINKS DO SHOW", etc.
+    lowered = data.lower()
+    found: List[Tuple[int, int]] = []
+    for header in LINKS_SECTION_HEADERS:
+        index = lowered.find(header)
+        if index >= 0:
+            found.append((index, index + len(header)))
+    
+    # If no specific section found, extract all links from the body
+    section_start, section_end = 0, len(data)
+    if found:
+        # The section runs until the next <h2>/<h3> heading; each search
+        # stops at the nearest terminator seen so far, and the regex below is
+        # bounded with pos/endpos so nothing past the section end is scanned
+        # or copied out
+        section_start = min(found)[1]
+        for tag in LINKS_SECTION_TERMINATORS:
+            end = lowered.find(tag, section_start, section_end)
+            if end >= 0:
+                section_end = end
+    
+    # Pull (href, text) pairs out in one regex pass; commented-out anchors
+    # are not special-cased, which is an accepted trade-off for speed
+    links: List[Dict[str, str]] = []
+    for match in ANCHOR_RE.finditer(data, section_start, section_end):
+        url = match.group(1) or match.group(2) or match.group(3)
+        if not url:
+            continue
+        text = TAG_RE.sub(b'', match.group(4))
+        links.append({
+            'text': unescape(text.decode('utf-8')).strip(),
+            'url': unescape(url.decode('utf-8'))
+        })
+    
+    return links
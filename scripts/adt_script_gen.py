@@ -4,199 +4,429 @@ Gigahertz FM Links Library Generator
 Generates a static HTML website for GitHub Pages displaying episode links from Gigahertz FM podcasts
 """
 
+import asyncio
+import gzip
+import hashlib
 import json
 import os
-import re
-import requests
+import sqlite3
+import httpx
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
-from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+from adt_parse import extract_episode_links
 
 # API Base URL
 API_BASE = "https://gigahertz.fm/api"
 
-class LinkExtractor(HTMLParser):
-    """Extract links from HTML content"""
-    def __init__(self):
-        super().__init__()
-        self.links = []
-        self.current_text = ""
-        self.in_link = False
-        
-    def handle_starttag(self, tag, attrs):
-        if tag == 'a':
-            self.in_link = True
-            self.current_text = ""
-            for attr, value in attrs:
-                if attr == 'href':
-                    self.current_url = value
-                    
-    def handle_endtag(self, tag):
-        if tag == 'a' and self.in_link:
-            self.links.append({
-                'text': self.current_text.strip(),
-                'url': self.current_url
-            })
-            self.in_link = False
-            
-    def handle_data(self, data):
-        if self.in_link:
-            self.current_text += data
-
-def extract_episode_links(body_html: str) -> List[Dict[str, str]]:
-    """Extract links from the episode body, specifically from 'LINKS DO EPISÓDIO' section"""
-    if not body_html:
-        return []
+# Concurrency limits for episode fetching. Every endpoint lives on one
+# origin, so HTTP/2 multiplexes the in-flight requests over one kept-alive
+# socket; the pool is still sized for every request in flight in case the
+# server only speaks HTTP/1.1
+MAX_CONCURRENT_REQUESTS = 16
+MAX_CONNECTIONS = MAX_CONCURRENT_REQUESTS
+FETCH_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Retries for transient failures: connection errors are retried by the
+# transport, these status codes by fetch_json with exponential backoff
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Episode bodies handed to each link-extraction worker at a time
+EXTRACT_CHUNKSIZE = 64
+
+# On-disk caches of API responses and extracted links, kept between runs
+CACHE_FILE = "gigahertz_cache.sqlite"
+LINK_CACHE_FILE = "links_cache.sqlite"
+
+# Episodes collected so far and the newest episode number seen per podcast
+STATE_FILE = "last_seen.json"
+
+# Bump whenever extract_episode_links changes its output for the same body;
+# this invalidates both the link cache and the saved state
+LINK_CACHE_VERSION = 3
+
+# Set to 1 to also write gzip/brotli copies of the generated page
+PRECOMPRESS_ENV = "ADT_PRECOMPRESS"
+
+# Column order of the packed episode rows embedded in the page
+EPISODE_COLUMNS = ['id', 'episodeNumber', 'title', 'date', 'permalink', 'podcast', 'links']
+
+class LinkCache:
+    """Persist extracted links in a SQLite file keyed by a hash of the episode body"""
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS links (hash BLOB PRIMARY KEY, links TEXT NOT NULL)')
+        
+    @staticmethod
+    def key(body_html: str) -> bytes:
+        """Hash a body together with the extractor version, so extractor changes invalidate old entries"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(LINK_CACHE_VERSION.to_bytes(4, 'big'))
+        digest.update((body_html or '').encode('utf-8'))
+        return digest.digest()
+        
+    def get(self, key: bytes) -> Optional[List[Dict[str, str]]]:
+        row = self.db.execute('SELECT links FROM links WHERE hash = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+        
+    def set(self, key: bytes, links: List[Dict[str, str]]):
+        self.db.execute('INSERT OR REPLACE INTO links (hash, links) VALUES (?, ?)', (key, json.dumps(links)))
+        
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def try_extract_episode_links(body_html: str) -> Union[List[Dict[str, str]], Exception]:
+    """Extract links from one body, returning the exception instead of raising it"""
+    try:
+        return extract_episode_links(body_html)
+    except Exception as e:
+        return e
+
+def extract_all_links(bodies: List[str]) -> List[Union[List[Dict[str, str]], Exception]]:
+    """Extract links from many episode bodies, parsing only those not seen before.
     
-    # Find the "LINKS DO EPISÓDIO" section
-    # Common variations: "LINKS DO EPISÓDIO", "Links do Episódio", "LINKS", etc.
-    links_pattern = r'(?:LINKS DO EPISÓDIO|Links do Episódio|LINKS DO SHOW|Links do Show)(.*?)(?:<h2>|<h3>|$)'
-    match = re.search(links_pattern, body_html, re.IGNORECASE | re.DOTALL)
+    Previously parsed bodies are looked up by hash; the rest are spread
+    across all CPU cores. Like asyncio.gather(return_exceptions=True), a
+    body that fails to parse yields its exception in place of the links.
+    """
+    cache = LinkCache(LINK_CACHE_FILE)
+    try:
+        extracted: List[Any] = []
+        keys: Dict[int, bytes] = {}
+        for i, body in enumerate(bodies):
+            try:
+                keys[i] = LinkCache.key(body)
+                extracted.append(cache.get(keys[i]))
+            except Exception as e:
+                extracted.append(e)
+        
+        misses = [i for i, links in enumerate(extracted) if links is None]
+        print(f"Parsing {len(misses)} new episode bodies ({len(keys) - len(misses)} cached)")
+        
+        if misses:
+            with ProcessPoolExecutor() as executor:
+                parsed = executor.map(try_extract_episode_links, [bodies[i] for i in misses], chunksize=EXTRACT_CHUNKSIZE)
+                for i, links in zip(misses, parsed):
+                    extracted[i] = links
+                    if not isinstance(links, Exception):
+                        cache.set(keys[i], links)
+    finally:
+        cache.close()
     
-    if not match:
-        # If no specific section found, try to extract all links from the body
-        links_section = body_html
-    else:
-        links_section = match.group(1)
+    return extracted
+
+class ResponseCache:
+    """Persist raw API response bodies and their validators in a SQLite file keyed by URL"""
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS responses '
+            '(url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT)'
+        )
+        
+    def get(self, url: str) -> Optional[Tuple[bytes, Optional[str], Optional[str]]]:
+        """Return (body, etag, last_modified) for a cached URL"""
+        return self.db.execute(
+            'SELECT body, etag, last_modified FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        
+    def set(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.db.execute(
+            'INSERT OR REPLACE INTO responses (url, body, etag, last_modified) VALUES (?, ?, ?, ?)',
+            (url, body, etag, last_modified)
+        )
+        
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+async def fetch_json(client: httpx.AsyncClient, cache: ResponseCache, url: str,
+                     immutable: bool = False) -> Dict[str, Any]:
+    """Fetch a JSON document, capping the number of requests in flight.
+    
+    Immutable documents are served from the cache when present; everything
+    else is revalidated with a conditional GET and the cached body reused
+    when the server answers 304 Not Modified.
+    """
+    cached = cache.get(url)
+    if cached and immutable:
+        return orjson.loads(cached[0])
+    
+    headers = {}
+    if cached:
+        _, etag, last_modified = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    
+    for attempt in range(MAX_RETRIES + 1):
+        async with FETCH_SEMAPHORE:
+            response = await client.get(url, headers=headers)
+        
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
     
-    # Extract links using HTMLParser
-    parser = LinkExtractor()
-    parser.feed(links_section)
+    if response.status_code == 304 and cached:
+        return orjson.loads(cached[0])
+    response.raise_for_status()
     
-    return parser.links
+    body = response.content
+    data = orjson.loads(body)
+    cache.set(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return data
 
-def fetch_podcasts() -> List[Dict[str, Any]]:
+async def fetch_podcasts(client: httpx.AsyncClient, cache: ResponseCache) -> List[Dict[str, Any]]:
     """Fetch all podcasts from Gigahertz API"""
     print("Fetching podcasts list...")
-    response = requests.get(f"{API_BASE}/podcasts.json")
-    response.raise_for_status()
-    data = response.json()
+    data = await fetch_json(client, cache, f"{API_BASE}/podcasts.json")
     return data.get('podcasts', [])
 
-def fetch_podcast_details(slug: str) -> Dict[str, Any]:
+async def fetch_podcast_details(client: httpx.AsyncClient, cache: ResponseCache, slug: str) -> Dict[str, Any]:
     """Fetch detailed information about a specific podcast including episodes"""
     print(f"Fetching details for podcast: {slug}")
-    response = requests.get(f"{API_BASE}/podcasts/{slug}/index.json")
-    response.raise_for_status()
-    return response.json()
+    return await fetch_json(client, cache, f"{API_BASE}/podcasts/{slug}/index.json")
 
-def fetch_episode_details(slug: str, episode_number: int) -> Dict[str, Any]:
-    """Fetch detailed information about a specific episode"""
+async def fetch_episode_details(client: httpx.AsyncClient, cache: ResponseCache,
+                                slug: str, episode_number: int) -> Dict[str, Any]:
+    """Fetch detailed information about a specific episode (published episodes never change)"""
     print(f"Fetching episode {episode_number} of {slug}")
-    response = requests.get(f"{API_BASE}/podcasts/{slug}/{episode_number}.json")
-    response.raise_for_status()
-    return response.json()
+    return await fetch_json(client, cache, f"{API_BASE}/podcasts/{slug}/{episode_number}.json", immutable=True)
 
-def collect_all_episodes() -> List[Dict[str, Any]]:
-    """Collect all episodes from all podcasts with their links"""
-    all_episodes = []
+def has_show_notes(episode_info: Dict[str, Any]) -> bool:
+    """Check a podcast index entry for hints that the episode has no body.
     
-    podcasts = fetch_podcasts()
+    Entries flagged with hasBody=false or contentLength=0 are not worth
+    fetching; entries without such hints are assumed to have show notes.
+    """
+    if episode_info.get('hasBody') is False:
+        return False
     
-    for podcast in podcasts:
-        slug = podcast.get('slug')
-        podcast_title = podcast.get('title', 'Unknown Podcast')
-        
-        if not slug:
-            continue
+    return episode_info.get('contentLength') != 0
+
+def load_state() -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """Load the newest episode number seen per podcast and the episodes collected by the last run"""
+    try:
+        with open(STATE_FILE, 'rb') as f:
+            state = orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}, []
+    
+    # Episodes parsed by a different extractor version must be parsed again
+    if state.get('linkCacheVersion') != LINK_CACHE_VERSION:
+        return {}, []
+    
+    return state['lastSeen'], state['episodes']
+
+def save_state(last_seen: Dict[str, int], episodes: List[Dict[str, Any]]):
+    """Persist the newest episode number seen per podcast and the collected episodes"""
+    state = {'linkCacheVersion': LINK_CACHE_VERSION, 'lastSeen': last_seen, 'episodes': episodes}
+    with open(STATE_FILE, 'wb') as f:
+        f.write(orjson.dumps(state))
+
+async def collect_all_episodes() -> List[Dict[str, Any]]:
+    """Collect all episodes from all podcasts with their links.
+    
+    Only episodes newer than the ones seen by the previous run are fetched
+    and parsed; older episodes are carried over from the saved state.
+    """
+    last_seen, previous_episodes = load_state()
+    stored = {(ep['podcastSlug'], ep['episodeNumber']): ep for ep in previous_episodes}
+    collected = {}
+    next_seen = {}
+    
+    cache = ResponseCache(CACHE_FILE)
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=MAX_RETRIES)
+    try:
+        async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+            podcasts = await fetch_podcasts(client, cache)
+            podcasts = [p for p in podcasts if p.get('slug')]
             
-        try:
-            # Fetch podcast details to get episode list
-            podcast_details = fetch_podcast_details(slug)
-            episodes = podcast_details.get('episodes', [])
+            # Fetch podcast details to get episode lists
+            details = await asyncio.gather(
+                *(fetch_podcast_details(client, cache, podcast['slug']) for podcast in podcasts),
+                return_exceptions=True
+            )
             
-            # Fetch detailed information for each episode
-            for episode_info in episodes:
-                episode_number = episode_info.get('episodeNumber')
+            pairs = []
+            for podcast, podcast_details in zip(podcasts, details):
+                slug = podcast['slug']
+                seen = last_seen.get(slug, 0)
                 
-                if episode_number is None:
+                if isinstance(podcast_details, Exception):
+                    print(f"Error fetching podcast {slug}: {podcast_details}")
+                    # Keep what earlier runs collected for this podcast
+                    collected.update((key, ep) for key, ep in stored.items() if key[0] == slug)
+                    if slug in last_seen:
+                        next_seen[slug] = seen
                     continue
                 
-                try:
-                    episode_details = fetch_episode_details(slug, episode_number)
+                podcast_title = podcast.get('title', 'Unknown Podcast')
+                newest = seen
+                skipped = []
+                for episode_info in podcast_details.get('episodes', []):
+                    episode_number = episode_info.get('episodeNumber')
                     
-                    # Extract links from episode body
-                    body = episode_details.get('body', '')
-                    links = extract_episode_links(body)
+                    if episode_number is None:
+                        continue
                     
-                    # Only include episodes that have links
-                    if links:
-                        episode_data = {
-                            'id': episode_details.get('id'),
-                            'episodeNumber': episode_number,
-                            'title': episode_details.get('title', ''),
-                            'date': episode_details.get('date', ''),
-                            'permalink': episode_details.get('permalink', ''),
-                            'podcastTitle': podcast_title,
-                            'podcastSlug': slug,
-                            'links': links
-                        }
-                        
-                        all_episodes.append(episode_data)
+                    newest = max(newest, episode_number)
+                    if episode_number <= seen:
+                        # Already handled by an earlier run
+                        if (slug, episode_number) in stored:
+                            episode_data = {**stored[(slug, episode_number)], 'podcastTitle': podcast_title}
+                            collected[(slug, episode_number)] = episode_data
+                        continue
                     
-                except Exception as e:
-                    print(f"Error fetching episode {episode_number} of {slug}: {e}")
-                    continue
+                    if not has_show_notes(episode_info):
+                        # No show notes yet; look at this episode again next run
+                        skipped.append(episode_number)
+                        continue
                     
-        except Exception as e:
-            print(f"Error fetching podcast {slug}: {e}")
+                    # Reserve the slot so episodes keep the index order
+                    collected[(slug, episode_number)] = None
+                    pairs.append((slug, podcast_title, episode_number))
+                
+                next_seen[slug] = min([newest] + [n - 1 for n in skipped])
+            
+            print(f"Fetching {len(pairs)} new episodes...")
+            
+            # Fetch detailed information for every new episode concurrently
+            results = await asyncio.gather(
+                *(fetch_episode_details(client, cache, slug, n) for slug, _, n in pairs),
+                return_exceptions=True
+            )
+    finally:
+        cache.close()
+    
+    fetched = []
+    for (slug, podcast_title, episode_number), episode_details in zip(pairs, results):
+        if isinstance(episode_details, Exception):
+            print(f"Error fetching episode {episode_number} of {slug}: {episode_details}")
+            # Retry this episode (and any newer one) on the next run
+            next_seen[slug] = min(next_seen[slug], episode_number - 1)
+            continue
+        
+        fetched.append((slug, podcast_title, episode_number, episode_details))
+    
+    # Extract links from episode bodies
+    print(f"Extracting links from {len(fetched)} episodes...")
+    bodies = [episode_details.get('body', '') for _, _, _, episode_details in fetched]
+    extracted = extract_all_links(bodies)
+    
+    for (slug, podcast_title, episode_number, episode_details), links in zip(fetched, extracted):
+        if isinstance(links, Exception):
+            print(f"Error extracting links from episode {episode_number} of {slug}: {links}")
+            # Retry this episode (and any newer one) on the next run
+            next_seen[slug] = min(next_seen[slug], episode_number - 1)
             continue
+        
+        # Only include episodes that have links
+        if links:
+            episode_data = {
+                'id': episode_details.get('id'),
+                'episodeNumber': episode_number,
+                'title': episode_details.get('title', ''),
+                'date': episode_details.get('date', ''),
+                'permalink': episode_details.get('permalink', ''),
+                'podcastTitle': podcast_title,
+                'podcastSlug': slug,
+                'links': links
+            }
+            
+            collected[(slug, episode_number)] = episode_data
     
     # Sort episodes by date (newest first)
+    all_episodes = [ep for ep in collected.values() if ep is not None]
     all_episodes.sort(key=lambda x: x.get('date', ''), reverse=True)
     
+    save_state(next_seen, all_episodes)
+    
     return all_episodes
 
-def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
-    """Generate the HTML page with all episode links"""
+def pack_episodes(episodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Lay episodes out column-wise for embedding in the page.
     
-    # Convert episodes to JSON for JavaScript
-    episodes_json = json.dumps(episodes, ensure_ascii=False)
+    Repeating every key name for every episode and link dominates the size
+    of the embedded JSON, so episodes become rows under a single list of
+    column names, links become [text, url] pairs and each podcast's title
+    and slug are stored once and referenced by index.
+    """
+    podcasts = []
+    podcast_index = {}
+    rows = []
+    
+    for episode in episodes:
+        podcast = (episode['podcastTitle'], episode['podcastSlug'])
+        if podcast not in podcast_index:
+            podcast_index[podcast] = len(podcasts)
+            podcasts.append(podcast)
+        
+        rows.append([
+            episode['id'],
+            episode['episodeNumber'],
+            episode['title'],
+            episode['date'],
+            episode['permalink'],
+            podcast_index[podcast],
+            [[link['text'], link['url']] for link in episode['links']]
+        ])
     
-    html = f"""<!DOCTYPE html>
+    return {'cols': EPISODE_COLUMNS, 'podcasts': podcasts, 'rows': rows}
+
+# Static parts of the generated page, encoded once. The page is written as
+# HTML_PREFIX + generation date + HTML_MIDDLE + episodes JSON + HTML_SUFFIX
+HTML_PREFIX = """<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Gigahertz FM - Biblioteca de Links</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
         
-        header {{
+        header {
             text-align: center;
             color: white;
             margin-bottom: 30px;
-        }}
+        }
         
-        h1 {{
+        h1 {
             font-size: 2.5rem;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
+        }
         
-        .subtitle {{
+        .subtitle {
             font-size: 1.2rem;
             opacity: 0.9;
             margin-bottom: 5px;
-        }}
+        }
         
-        .last-update {{
+        .last-update {
             font-size: 0.9rem;
             opacity: 0.8;
             margin-top: 10px;
@@ -204,17 +434,17 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
             background: rgba(255, 255, 255, 0.2);
             border-radius: 20px;
             display: inline-block;
-        }}
+        }
         
-        .search-container {{
+        .search-container {
             background: white;
             border-radius: 10px;
             padding: 20px;
             margin-bottom: 20px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
+        }
         
-        .search-box {{
+        .search-box {
             width: 100%;
             padding: 15px;
             font-size: 1rem;
@@ -222,94 +452,94 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
             border-radius: 8px;
             outline: none;
             transition: border-color 0.3s;
-        }}
+        }
         
-        .search-box:focus {{
+        .search-box:focus {
             border-color: #667eea;
-        }}
+        }
         
-        .stats {{
+        .stats {
             text-align: center;
             color: #666;
             margin-top: 10px;
             font-size: 0.9rem;
-        }}
+        }
         
-        .episodes-list {{
+        .episodes-list {
             background: white;
             border-radius: 10px;
             overflow: hidden;
             box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
+        }
         
-        .episode {{
+        .episode {
             border-bottom: 1px solid #e0e0e0;
             padding: 20px;
-        }}
+        }
         
-        .episode:last-child {{
+        .episode:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .episode-header {{
+        .episode-header {
             margin-bottom: 15px;
-        }}
+        }
         
-        .episode-meta {{
+        .episode-meta {
             display: flex;
             flex-wrap: wrap;
             gap: 10px;
             align-items: center;
             margin-bottom: 8px;
-        }}
+        }
         
-        .podcast-badge {{
+        .podcast-badge {
             background: #764ba2;
             color: white;
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 0.85rem;
             font-weight: 500;
-        }}
+        }
         
-        .episode-number {{
+        .episode-number {
             background: #667eea;
             color: white;
             padding: 4px 12px;
             border-radius: 20px;
             font-size: 0.85rem;
             font-weight: bold;
-        }}
+        }
         
-        .episode-date {{
+        .episode-date {
             color: #666;
             font-size: 0.85rem;
-        }}
+        }
         
-        .episode-title {{
+        .episode-title {
             font-size: 1.1rem;
             font-weight: 600;
             color: #333;
             margin: 8px 0;
-        }}
+        }
         
-        .episode-title a {{
+        .episode-title a {
             color: #333;
             text-decoration: none;
             transition: color 0.2s;
-        }}
+        }
         
-        .episode-title a:hover {{
+        .episode-title a:hover {
             color: #667eea;
-        }}
+        }
         
-        .links-section {{
+        .links-section {
             display: flex;
             flex-direction: column;
             gap: 8px;
-        }}
+        }
         
-        .link-item {{
+        .link-item {
             display: flex;
             align-items: center;
             padding: 10px 15px;
@@ -319,70 +549,70 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
             color: #333;
             transition: all 0.2s;
             border-left: 3px solid #667eea;
-        }}
+        }
         
-        .link-item:hover {{
+        .link-item:hover {
             background: #e9ecef;
             transform: translateX(5px);
             box-shadow: 0 2px 8px rgba(102, 126, 234, 0.2);
-        }}
+        }
         
-        .link-icon {{
+        .link-icon {
             margin-right: 10px;
             font-size: 1.2rem;
-        }}
+        }
         
-        .link-text {{
+        .link-text {
             flex: 1;
             font-size: 0.95rem;
-        }}
+        }
         
-        .external-icon {{
+        .external-icon {
             opacity: 0.5;
             font-size: 0.8rem;
-        }}
+        }
         
-        .no-results {{
+        .no-results {
             text-align: center;
             padding: 60px 20px;
             color: #666;
-        }}
+        }
         
-        .no-results-icon {{
+        .no-results-icon {
             font-size: 4rem;
             margin-bottom: 20px;
-        }}
+        }
         
-        .loading {{
+        .loading {
             text-align: center;
             padding: 40px;
             color: #666;
             font-size: 1.2rem;
-        }}
+        }
         
-        footer {{
+        footer {
             text-align: center;
             color: white;
             margin-top: 40px;
             padding: 20px;
             opacity: 0.8;
-        }}
+        }
         
-        footer a {{
+        footer a {
             color: white;
             text-decoration: underline;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            h1 {{
+        @media (max-width: 768px) {
+            h1 {
                 font-size: 1.8rem;
-            }}
+            }
             
-            .episode-meta {{
+            .episode-meta {
                 flex-direction: column;
                 align-items: flex-start;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -391,7 +621,9 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
             <h1>🎙️ Gigahertz FM</h1>
             <p class="subtitle">Biblioteca de Links dos Episódios</p>
             <div class="last-update">
-                📅 Atualizado em: {generation_date}
+                📅 Atualizado em: """
+
+HTML_MIDDLE = """
             </div>
         </header>
         
@@ -417,52 +649,53 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
     </div>
     
     <script>
-        // Episodes data
-        const allEpisodes = {episodes_json};
+        // Episodes data, packed column-wise (see pack_episodes)
+        const episodesData = """
+
+HTML_SUFFIX = """;
+        const allEpisodes = episodesData.rows.map(row => {
+            const episode = Object.fromEntries(episodesData.cols.map((col, i) => [col, row[i]]));
+            [episode.podcastTitle, episode.podcastSlug] = episodesData.podcasts[episode.podcast];
+            episode.links = episode.links.map(([text, url]) => ({ text, url }));
+            
+            // Lowercased copy of every searchable field, built once so each
+            // keystroke needs a single includes() per episode; the \\x01
+            // separator keeps a term from matching across two fields
+            episode._lc = [
+                String(episode.episodeNumber || ''),
+                episode.title || '',
+                episode.podcastTitle || '',
+                ...episode.links.flatMap(link => [link.text, link.url])
+            ].join('\\x01').toLowerCase();
+            return episode;
+        });
         let filteredEpisodes = [...allEpisodes];
         
         // Initialize
-        document.addEventListener('DOMContentLoaded', function() {{
+        document.addEventListener('DOMContentLoaded', function() {
             renderEpisodes(filteredEpisodes);
             updateStats();
             
             // Search functionality
             const searchBox = document.getElementById('searchBox');
-            searchBox.addEventListener('input', function(e) {{
+            searchBox.addEventListener('input', function(e) {
                 const searchTerm = e.target.value.toLowerCase().trim();
                 
-                if (searchTerm === '') {{
+                if (searchTerm === '') {
                     filteredEpisodes = [...allEpisodes];
-                }} else {{
-                    filteredEpisodes = allEpisodes.filter(episode => {{
-                        const episodeNumber = String(episode.episodeNumber || '');
-                        const title = (episode.title || '').toLowerCase();
-                        const podcastTitle = (episode.podcastTitle || '').toLowerCase();
-                        
-                        // Check if search term matches episode info
-                        const matchesEpisodeInfo = episodeNumber.includes(searchTerm) || 
-                                                   title.includes(searchTerm) || 
-                                                   podcastTitle.includes(searchTerm);
-                        
-                        // Check if search term matches any link text or URL
-                        const matchesLinks = episode.links.some(link => 
-                            link.text.toLowerCase().includes(searchTerm) || 
-                            link.url.toLowerCase().includes(searchTerm)
-                        );
-                        
-                        return matchesEpisodeInfo || matchesLinks;
-                    }});
-                }}
+                } else {
+                    filteredEpisodes = allEpisodes.filter(episode => episode._lc.includes(searchTerm));
+                }
                 
                 renderEpisodes(filteredEpisodes);
                 updateStats();
-            }});
-        }});
+            });
+        });
         
-        function renderEpisodes(episodes) {{
+        function renderEpisodes(episodes) {
             const container = document.getElementById('episodesList');
             
-            if (episodes.length === 0) {{
+            if (episodes.length === 0) {
                 container.innerHTML = `
                     <div class="no-results">
                         <div class="no-results-icon">🔍</div>
@@ -471,20 +704,20 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
                     </div>
                 `;
                 return;
-            }}
+            }
             
-            container.innerHTML = episodes.map(episode => {{
+            container.innerHTML = episodes.map(episode => {
                 const date = new Date(episode.date);
-                const formattedDate = date.toLocaleDateString('pt-BR', {{
+                const formattedDate = date.toLocaleDateString('pt-BR', {
                     day: '2-digit',
                     month: 'long',
                     year: 'numeric'
-                }});
+                });
                 
                 const linksHTML = episode.links.map(link => `
-                    <a href="${{link.url}}" target="_blank" class="link-item">
+                    <a href="${link.url}" target="_blank" class="link-item">
                         <span class="link-icon">🔗</span>
-                        <span class="link-text">${{link.text}}</span>
+                        <span class="link-text">${link.text}</span>
                         <span class="external-icon">↗</span>
                     </a>
                 `).join('');
@@ -493,23 +726,23 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
                     <div class="episode">
                         <div class="episode-header">
                             <div class="episode-meta">
-                                <span class="podcast-badge">${{episode.podcastTitle}}</span>
-                                <span class="episode-number">#${{episode.episodeNumber}}</span>
-                                <span class="episode-date">${{formattedDate}}</span>
+                                <span class="podcast-badge">${episode.podcastTitle}</span>
+                                <span class="episode-number">#${episode.episodeNumber}</span>
+                                <span class="episode-date">${formattedDate}</span>
                             </div>
                             <h2 class="episode-title">
-                                <a href="${{episode.permalink}}" target="_blank">${{episode.title}}</a>
+                                <a href="${episode.permalink}" target="_blank">${episode.title}</a>
                             </h2>
                         </div>
                         <div class="links-section">
-                            ${{linksHTML}}
+                            ${linksHTML}
                         </div>
                     </div>
                 `;
-            }}).join('');
-        }}
+            }).join('');
+        }
         
-        function updateStats() {{
+        function updateStats() {
             const statsText = document.getElementById('statsText');
             const total = allEpisodes.length;
             const showing = filteredEpisodes.length;
@@ -517,17 +750,52 @@ def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> str:
             const totalLinks = allEpisodes.reduce((sum, ep) => sum + ep.links.length, 0);
             const showingLinks = filteredEpisodes.reduce((sum, ep) => sum + ep.links.length, 0);
             
-            if (showing === total) {{
-                statsText.textContent = `${{total}} episódio${{total !== 1 ? 's' : ''}} • ${{totalLinks}} links disponíveis`;
-            }} else {{
-                statsText.textContent = `Mostrando ${{showing}} de ${{total}} episódios • ${{showingLinks}} links`;
-            }}
-        }}
+            if (showing === total) {
+                statsText.textContent = `${total} episódio${total !== 1 ? 's' : ''} • ${totalLinks} links disponíveis`;
+            } else {
+                statsText.textContent = `Mostrando ${showing} de ${total} episódios • ${showingLinks} links`;
+            }
+        }
     </script>
 </body>
 </html>"""
+
+HTML_PREFIX_BYTES = HTML_PREFIX.encode('utf-8')
+HTML_MIDDLE_BYTES = HTML_MIDDLE.encode('utf-8')
+HTML_SUFFIX_BYTES = HTML_SUFFIX.encode('utf-8')
+
+def generate_html(episodes: List[Dict[str, Any]], generation_date: str) -> List[bytes]:
+    """Generate the HTML page with all episode links.
     
-    return html
+    The page is returned as encoded chunks to be written in order, so the
+    episodes JSON is never joined into one giant string with the template.
+    """
+    
+    # Convert episodes to JSON for JavaScript
+    episodes_data = pack_episodes(episodes)
+    
+    return [
+        HTML_PREFIX_BYTES,
+        generation_date.encode('utf-8'),
+        HTML_MIDDLE_BYTES,
+        orjson.dumps(episodes_data),
+        HTML_SUFFIX_BYTES
+    ]
+
+def write_precompressed(output_file: str, chunks: List[bytes]):
+    """Write gzip and brotli compressed copies of the page next to it"""
+    # Only needed for this opt-in step, so not part of requirements.txt
+    import brotli
+    
+    # mtime=0 keeps the .gz byte-identical when the page has not changed
+    with gzip.GzipFile(f"{output_file}.gz", 'wb', compresslevel=9, mtime=0) as f:
+        f.writelines(chunks)
+    
+    compressor = brotli.Compressor(quality=11)
+    with open(f"{output_file}.br", 'wb') as f:
+        for chunk in chunks:
+            f.write(compressor.process(chunk))
+        f.write(compressor.finish())
 
 def main():
     """Main function to generate the static site"""
@@ -542,7 +810,7 @@ def main():
     try:
         # Collect all episodes
         print("Starting to collect episodes and extract links...")
-        episodes = collect_all_episodes()
+        episodes = asyncio.run(collect_all_episodes())
         print(f"\nTotal episodes with links: {len(episodes)}")
         
         total_links = sum(len(ep['links']) for ep in episodes)
@@ -550,14 +818,21 @@ def main():
         
         # Generate HTML
         print("\nGenerating HTML...")
-        html = generate_html(episodes, generation_date)
+        chunks = generate_html(episodes, generation_date)
         
         # Save to file
         output_file = "index.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html)
+        with open(output_file, 'wb') as f:
+            f.writelines(chunks)
         
         print(f"\n✅ Successfully generated {output_file}")
+        
+        # Pre-compressed copies are only useful on hosts that serve them
+        # directly (GitHub Pages does not), so they are opt-in
+        if os.environ.get(PRECOMPRESS_ENV) == '1':
+            write_precompressed(output_file, chunks)
+            print(f"✅ Wrote {output_file}.gz and {output_file}.br")
+        
         print(f"📊 Statistics:")
         print(f"   - Episodes with links: {len(episodes)}")
         print(f"   - Total links: {total_links}")